@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import functools
 from decimal import Decimal
 from enum import StrEnum
 from typing import ClassVar
@@ -393,6 +394,40 @@ for category, units in CATEGORY_2_UNITS.items():
         CATEGORY_BY_UNIT[unit] = category
 
 
+@functools.lru_cache(maxsize=1024)
+def _qr_slug(name: str) -> str:
+    """Slugify a unit name for its QR filename, falling back to "unit" if nothing survives."""
+    return slugify(name) or "unit"
+
+
+#: Recursive query returning a Unit and all of its parent Units, root first.
+#: Formatted with the Unit table name; takes the starting Unit id as its only parameter.
+UNIT_ANCESTORS_SQL = """
+WITH RECURSIVE ancestors(id, depth) AS (
+    SELECT id, 0 FROM {table} WHERE id = %s
+    UNION ALL
+    SELECT u.parent_unit_id, a.depth + 1
+    FROM {table} u JOIN ancestors a ON u.id = a.id
+    WHERE u.parent_unit_id IS NOT NULL
+)
+SELECT u.* FROM {table} u JOIN ancestors a ON u.id = a.id
+ORDER BY a.depth DESC
+"""
+
+#: Recursive query returning every Unit nested below a Unit, shallowest first.
+#: Formatted with the Unit table name; takes the parent Unit id as its only parameter.
+UNIT_DESCENDANTS_SQL = """
+WITH RECURSIVE descendants(id, depth) AS (
+    SELECT id, 1 FROM {table} WHERE parent_unit_id = %s
+    UNION ALL
+    SELECT u.id, d.depth + 1
+    FROM {table} u JOIN descendants d ON u.parent_unit_id = d.id
+)
+SELECT u.* FROM {table} u JOIN descendants d ON u.id = d.id
+ORDER BY d.depth, u.id
+"""
+
+
 class Unit(StorageSpace):
     """Generic storage unit (bin, locker, garage, van, shelf, workbench, etc.).
     
@@ -524,15 +559,7 @@ class Unit(StorageSpace):
         Returns:
             str: Human-readable path string with " > " separators.
         """
-        parts = []
-        current: Location | Unit | None = self
-
-        # Walk up the entire hierarchy (Units and Location)
-        while current:
-            parts.insert(0, current.name)
-            current = current.parent if isinstance(current, Unit) else None
-
-        return " > ".join(parts)
+        return " > ".join(ancestor.name for ancestor in self.get_ancestors())
 
     def get_ancestor_path(self) -> str:
         """Return hierarchical path from root to this unit's parent (excludes self).
@@ -548,11 +575,7 @@ class Unit(StorageSpace):
         Returns:
             str: Ancestor path with " > " separators, or empty string if no parent.
         """
-        full = self.get_full_path()
-        # Remove the last segment (self.name)
-        sep = " > "
-        idx = full.rfind(sep)
-        return full[:idx] if idx != -1 else ""
+        return " > ".join(ancestor.name for ancestor in self.get_ancestors()[:-1])
 
     def get_root_unit(self) -> Unit:
         """Return the top-level Unit in this hierarchy.
@@ -560,10 +583,7 @@ class Unit(StorageSpace):
         Returns:
             Unit: The root Unit (the one with no parent_unit).
         """
-        current = self
-        while isinstance(current.parent, Unit):
-            current = current.parent
-        return current
+        return self._unit_chain[0]
 
     def get_ancestors(self) -> list[Location | Unit]:
         """Return list of all ancestors from root to self.
@@ -575,29 +595,45 @@ class Unit(StorageSpace):
             list[Location | Unit]: List ordered from root to leaf, e.g.,
                 [<Location: My House>, <Unit: Garage>, <Unit: Workbench>, <Unit: Red Toolbox>]
         """
-        ancestors = []
-        current: Location | Unit | None = self
+        chain: list[Location | Unit] = list(self._unit_chain)
+        # Only the root Unit can sit in a Location
+        root = chain[0]
+        if root.location_id is not None:
+            chain.insert(0, root.location)
+        return chain
+
+    @functools.cached_property
+    def _unit_chain(self) -> list[Unit]:
+        """The Units from the root of this hierarchy down to self.
+
+        Fetches all parent Units in a single recursive query rather than one
+        query per ``parent_unit`` hop, or reuses a parent that is already
+        loaded (e.g. via ``select_related``). Cached on the instance, so
+        re-fetch the Unit after moving it to another parent.
 
-        # Walk up the entire hierarchy including Location
-        while current:
-            ancestors.insert(0, current)
-            current = current.parent if isinstance(current, Unit) else None
-
-        return ancestors
+        Returns:
+            list[Unit]: Units ordered from root to self.
+        """
+        if self.parent_unit_id is None:
+            return [self]
+        if Unit.parent_unit.is_cached(self):
+            return [*self.parent_unit._unit_chain, self]
+        parents = Unit.objects.raw(
+            UNIT_ANCESTORS_SQL.format(table=Unit._meta.db_table),
+            [self.parent_unit_id],
+        )
+        return [*parents, self]
 
     def get_descendants(self) -> list[Unit]:
         """Return all descendant Units (children, grandchildren, etc.).
         
         Used to prevent circular references when editing Unit hierarchy.
+        Fetches the whole subtree in a single recursive query.
         
         Returns:
-            list[Unit]: All Units nested within this Unit.
+            list[Unit]: All Units nested within this Unit, ordered by depth.
         """
-        descendants = []
-        for child in self.child_units.all():
-            descendants.append(child)
-            descendants.extend(child.get_descendants())
-        return descendants
+        return list(Unit.objects.raw(UNIT_DESCENDANTS_SQL.format(table=Unit._meta.db_table), [self.pk]))
 
     def has_children(self) -> bool:
         """Check if this Unit has any child Units.
@@ -658,7 +694,7 @@ class Unit(StorageSpace):
 
     def get_qr_filename(self) -> str:
         """Return a deterministic filename for the unit's QR code image."""
-        return f"{slugify(self.name) or 'unit'}_unit_qr.png"
+        return f"{_qr_slug(self.name)}_unit_qr.png"
 
     def get_detail_path(self) -> str:
         """Return the relative URL path to this unit's detail view."""
@@ -23,6 +23,20 @@ def get_qr_code(data: str) -> PilImage:
     return qrcode.make(data)
 
 
+def get_qr_code_bytes(data: str) -> bytes:
+    """Render a QR code containing the provided data string as PNG bytes.
+
+    Args:
+        data: The string content to embed in the QR code.
+
+    Returns:
+        bytes: The encoded PNG image.
+    """
+    buffer = BytesIO()
+    get_qr_code(data).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 def get_qr_code_file(data: str, filename: str) -> ContentFile:
     """Create a QR code file containing the provided data string.
 
@@ -33,8 +47,4 @@ def get_qr_code_file(data: str, filename: str) -> ContentFile:
     Returns:
         ContentFile: The generated QR code file ready for storage.
     """
-    qr_code = get_qr_code(data)
-    buffer = BytesIO()
-    qr_code.save(buffer, format="PNG")
-    buffer.seek(0)
-    return ContentFile(buffer.read(), name=filename)
+    return ContentFile(get_qr_code_bytes(data), name=filename)
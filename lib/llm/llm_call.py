@@ -23,6 +23,7 @@ class LLMCall(BaseModel):
     retry_timeout: float | None = None
     retry_limit: int | None = None
     max_wait_time: float | None = None
+    cache_responses: bool = False
 
     model_config = {"arbitrary_types_allowed": True}
 
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from langchain.prompts import (
+from langchain_aws.chat_models.bedrock import ChatBedrock
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import (
     ChatPromptTemplate,
     HumanMessagePromptTemplate,
     MessagesPlaceholder,
     SystemMessagePromptTemplate,
 )
-from langchain_aws.chat_models.bedrock import ChatBedrock
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.exceptions import OutputParserException
-from langchain_core.output_parsers import StrOutputParser
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from lib.llm.gemini_model_id import GeminiModelID
@@ -22,15 +24,27 @@ from lib.llm.gemini_model_id import GeminiModelID
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from langchain.schema.runnable import Runnable
     from langchain_core.language_models.base import LanguageModelInput
     from langchain_core.language_models.chat_models import BaseChatModel
-    from pydantic import BaseModel
+    from langchain_core.runnables import Runnable
 
     from aws_utils.region import AWSRegion
     from lib.llm.llm_call import LLMCall
 
 
+# Upper bound on cached responses shared by all handlers in the process
+RESPONSE_CACHE_MAX_SIZE = 256
+
+
+def _cache_key_default(value: object) -> dict[str, Any] | str:
+    """JSON fallback for values that appear in query kwargs (messages, schemas)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    return repr(value)
+
+
 class LLMHandler(ABC):
     """Abstract base class for handling LLM (Large Language Model) calls.
 
@@ -57,6 +71,9 @@ class LangChainHandler(LLMHandler):
     langchain_client: BaseChatModel
     chain: Runnable[LanguageModelInput, str | BaseModel]
 
+    # Exact-match response cache, keyed by _response_cache_key; only used when llm_call.cache_responses is set
+    _response_cache: ClassVar[dict[str, Any]] = {}
+
     def __init__(self, llm_call: LLMCall, region: AWSRegion | None = None) -> None:
         """Initialize the LLMHandler with an LLMCall and a LangChain chat client.
 
@@ -66,6 +83,8 @@ class LangChainHandler(LLMHandler):
         """
         self.llm_call = llm_call
         self._additional_messages: list[SystemMessage | HumanMessage] = []
+        # Prompt | client composition, built on first use and reused across queries
+        self._llm_chain: Runnable[LanguageModelInput, str | BaseModel] | None = None
 
         if isinstance(llm_call.model_id, GeminiModelID):
             client_params: dict[str, Any] = {
@@ -123,6 +142,30 @@ class LangChainHandler(LLMHandler):
         # Apply retry configuration if needed
         self._maybe_configure_retry()
 
+    def _response_cache_payload(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Return everything that determines the response to a query with these kwargs."""
+        return {
+            "handler": type(self).__name__,
+            "model_id": self.llm_call.model_id.value,
+            "temp": self.llm_call.temp,
+            "max_tokens": self.llm_call.max_tokens,
+            "system_prompt_tmplt": self.llm_call.system_prompt_tmplt,
+            "human_prompt_tmplt": self.llm_call.human_prompt_tmplt,
+            "kwargs": kwargs,
+        }
+
+    def _response_cache_key(self, kwargs: dict[str, Any]) -> str:
+        """Build a stable hash of the LLM call configuration and the query kwargs."""
+        payload = json.dumps(self._response_cache_payload(kwargs), sort_keys=True, default=_cache_key_default)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _store_cached_response(self, key: str, response: str | BaseModel) -> None:
+        """Cache a response, evicting the oldest entry once the cache is full."""
+        cache = LangChainHandler._response_cache
+        if len(cache) >= RESPONSE_CACHE_MAX_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = response
+
     def add_message(self, role: str, content: list[dict[str, Any]]) -> None:
         """Add a message to the handler's message chain.
 
@@ -162,8 +205,15 @@ class LangChainHandler(LLMHandler):
 
     @property
     def llm_chain(self) -> Runnable[LanguageModelInput, str | BaseModel]:
-        """Composes the prompt template with the llm."""
-        return self.lc_prompt_tmplt | self.langchain_client
+        """Composes the prompt template with the llm.
+
+        The prompt template only depends on the LLMCall, and additional messages are
+        injected per query through the placeholder, so the composed chain is built once
+        and reused by every subsequent query on this handler.
+        """
+        if self._llm_chain is None:
+            self._llm_chain = self.lc_prompt_tmplt | self.langchain_client
+        return self._llm_chain
 
     @property
     def chain(self) -> Runnable[LanguageModelInput, str | BaseModel]:
@@ -185,8 +235,16 @@ class LangChainHandler(LLMHandler):
             # Append handler's messages to any passed in via kwargs
             kwargs["additional_messages"] = self._additional_messages + kwargs["additional_messages"]
 
-        # Use the chain with the modified template that includes additional messages
-        return self.chain.invoke(kwargs)
+        if not self.llm_call.cache_responses:
+            # Use the chain with the modified template that includes additional messages
+            return self.chain.invoke(kwargs)
+
+        key = self._response_cache_key(kwargs)
+        if key in self._response_cache:
+            return self._response_cache[key]
+        response = self.chain.invoke(kwargs)
+        self._store_cached_response(key, response)
+        return response
 
     def _build_image_content(self, image_data: str, mime_type: str) -> dict[str, Any]:
         """Build a provider-appropriate image content block.
@@ -252,6 +310,10 @@ class StructuredLangChainHandler(LangChainHandler):
         """The runnable chain that calls the LLM and parses the output to a structured format."""
         return self.llm_chain
 
+    def _response_cache_payload(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Include the output schema, since it changes the tool the model is asked to call."""
+        return {**super()._response_cache_payload(kwargs), "output_schema": self.output_schema}
+
     @staticmethod
     def _build_reask_message_for_none() -> HumanMessage:
         """Build a reask message when the model fails to produce a tool call."""
@@ -330,11 +392,19 @@ class StructuredLangChainHandler(LangChainHandler):
         if self._additional_messages:
             kwargs["additional_messages"] = self._additional_messages + kwargs["additional_messages"]
 
+        # Computed before the reask loop appends feedback messages to kwargs
+        key = self._response_cache_key(kwargs) if self.llm_call.cache_responses else None
+        if key is not None and key in self._response_cache:
+            # Deep copies keep one caller's mutations out of every later hit
+            return self._response_cache[key].model_copy(deep=True)
+
         reask_limit = self.llm_call.retry_limit or 0
 
         for attempt in range(1 + reask_limit):
             result = self._try_invoke(kwargs, attempt, reask_limit)
             if result is not None:
+                if key is not None:
+                    self._store_cached_response(key, result.model_copy(deep=True))
                 return result
 
         msg = "Structured output returned None after all reask attempts"
@@ -49,7 +49,8 @@ def perform_candidate_search(user_query: str, user_id: int, k: int = 10) -> Item
         ItemSearchCandidates: A list of candidate items returned by the LLM,
             matching the search query.
     """
-    items = WMSUser.objects.get(id=user_id).accessible_items()
+    # Each item's to_search_input reads item.unit.name; join units up front
+    items = WMSUser.objects.get(id=user_id).accessible_items().select_related("unit")
     prompt_ctxt = get_item_search_context(items)
 
     # Create the StructuredLangChainHandler using the global LLMCall instance
@@ -1,13 +1,14 @@
+from collections.abc import Iterator
 from unittest.mock import MagicMock, patch
 
 import pytest
-from langchain.prompts import (
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompts import (
     HumanMessagePromptTemplate,
     MessagesPlaceholder,
     SystemMessagePromptTemplate,
 )
-from langchain.schema.messages import HumanMessage, SystemMessage
-from langchain_core.exceptions import OutputParserException
 from pydantic import BaseModel, ValidationError
 
 from aws_utils.model_id import ClaudeModelID
@@ -24,6 +25,10 @@ class DummyOutputSchema(BaseModel):
     field2: int
 
 
+# Prebuilt structured result shared by tests that only need a valid schema instance
+_EXPECTED_STRUCTURED = DummyOutputSchema(field1="test", field2=42)
+
+
 @pytest.fixture
 def system_prompt() -> str:
     """Fixture providing a system prompt for testing."""
@@ -101,12 +106,31 @@ class TestLangChainHandler:
         chain_result = "mock chain"
         prompt_mock.__or__.return_value = chain_result
 
-        with patch("langchain.prompts.ChatPromptTemplate.from_messages", return_value=prompt_mock):
+        with patch("langchain_core.prompts.ChatPromptTemplate.from_messages", return_value=prompt_mock):
             result = handler.llm_chain
 
         prompt_mock.__or__.assert_called_once_with(handler.langchain_client)
         assert result == chain_result
 
+    def test_llm_chain_built_once_across_queries(
+        self, llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock
+    ) -> None:
+        """Test that the prompt template is compiled and composed once per handler."""
+        handler = LangChainHandler(llm_call, region)
+        prompt_mock = MagicMock()
+        chain_mock = MagicMock()
+        chain_mock.__or__.return_value = chain_mock
+        chain_mock.invoke.return_value = "Expected response"
+        prompt_mock.__or__.return_value = chain_mock
+
+        with patch("langchain_core.prompts.ChatPromptTemplate.from_messages", return_value=prompt_mock) as mock_from_messages:
+            handler.query(question="First question?")
+            handler.query(question="Second question?")
+
+        mock_from_messages.assert_called_once()
+        prompt_mock.__or__.assert_called_once_with(handler.langchain_client)
+        assert chain_mock.invoke.call_count == 2
+
     def test_query_method(self, llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock) -> None:
         """Test that the query method correctly invokes the chain."""
         handler = LangChainHandler(llm_call, region)
@@ -296,32 +320,27 @@ class TestStructuredLangChainHandler:
     """Test cases for the StructuredLangChainHandler class."""
 
     @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        """Fixture providing an output schema for testing."""
-        return DummyOutputSchema
-
-    @pytest.fixture
-    def structured_llm_call(self, llm_call: LLMCall, output_schema: type[DummyOutputSchema]) -> LLMCall:
+    def structured_llm_call(self, request: pytest.FixtureRequest) -> LLMCall:
         """Fixture providing an LLMCall instance with an output schema."""
+        llm_call: LLMCall = request.getfixturevalue("llm_call")
         return LLMCall(
             system_prompt_tmplt=llm_call.system_prompt_tmplt,
             human_prompt_tmplt=llm_call.human_prompt_tmplt,
             model_id=llm_call.model_id,
-            output_schema=output_schema,
+            output_schema=DummyOutputSchema,
         )
 
     def test_init_with_schema(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that StructuredLangChainHandler initializes correctly with an output schema."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
         assert handler.llm_call == structured_llm_call
-        assert handler.output_schema == output_schema
+        assert handler.output_schema == DummyOutputSchema
 
         mock_bedrock_client.assert_called_once_with(
             model_id=structured_llm_call.model_id.value,
@@ -330,32 +349,29 @@ class TestStructuredLangChainHandler:
         )
 
         mock_instance = mock_bedrock_client.return_value
-        mock_instance.with_structured_output.assert_called_once_with(output_schema)
+        mock_instance.with_structured_output.assert_called_once_with(DummyOutputSchema)
 
     def test_chain_property_returns_llm_chain(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that the chain property returns the llm_chain directly."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
         with patch.object(StructuredLangChainHandler, "llm_chain") as mock_llm_chain:
             assert handler.chain == mock_llm_chain
 
     def test_query_returns_structured_output(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that the query method returns structured output."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
-        expected_field_value = 42
-        mock_structured_output = DummyOutputSchema(field1="test", field2=expected_field_value)
+        mock_structured_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = mock_structured_output
@@ -369,17 +385,16 @@ class TestStructuredLangChainHandler:
         assert result == mock_structured_output
         assert isinstance(result, DummyOutputSchema)
         assert result.field1 == "test"
-        assert result.field2 == expected_field_value
+        assert result.field2 == 42
 
     def test_structured_handler_multimodal_support(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that StructuredLangChainHandler supports multimodal content."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
         multimodal_content = [
             {"type": "text", "text": "Analyze this image for structured output."},
@@ -398,7 +413,7 @@ class TestStructuredLangChainHandler:
         assert len(template.messages) == 3
         assert isinstance(template.messages[2], MessagesPlaceholder)
 
-        expected_output = DummyOutputSchema(field1="extracted_from_image", field2=99)
+        expected_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = expected_output
@@ -413,12 +428,11 @@ class TestStructuredLangChainHandler:
     def test_structured_handler_multiple_images(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test structured handler with multiple images."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
         handler.add_message(
             "user",
@@ -438,7 +452,7 @@ class TestStructuredLangChainHandler:
 
         assert len(handler._additional_messages) == 2
 
-        expected_output = DummyOutputSchema(field1="multi_image_analysis", field2=150)
+        expected_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = expected_output
@@ -450,14 +464,13 @@ class TestStructuredLangChainHandler:
     def test_structured_query_with_image(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that StructuredLangChainHandler query_with_image returns structured output."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
-        expected_output = DummyOutputSchema(field1="structured_image_analysis", field2=777)
+        expected_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = expected_output
@@ -490,20 +503,19 @@ class TestStructuredLangChainHandler:
 
         assert result == expected_output
         assert isinstance(result, DummyOutputSchema)
-        assert result.field1 == "structured_image_analysis"
-        assert result.field2 == 777
+        assert result.field1 == "test"
+        assert result.field2 == 42
 
     def test_structured_query_with_image_default_mime_type(
         self,
         structured_llm_call: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Test that StructuredLangChainHandler query_with_image uses default MIME type."""
-        handler = StructuredLangChainHandler(structured_llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(structured_llm_call, DummyOutputSchema, region)
 
-        expected_output = DummyOutputSchema(field1="default_mime_structured", field2=333)
+        expected_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = expected_output
@@ -530,10 +542,6 @@ class TestStructuredLangChainHandler:
 class TestStructuredReask:
     """Test cases for the reask loop in StructuredLangChainHandler."""
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     @pytest.fixture
     def llm_call_no_retry(self, system_prompt: str, model_id: ClaudeModelID) -> LLMCall:
         """LLMCall without retry (default behavior)."""
@@ -554,12 +562,11 @@ class TestStructuredReask:
     def test_query_none_without_retry_raises(
         self,
         llm_call_no_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When retry is disabled and invoke returns None, raises immediately."""
-        handler = StructuredLangChainHandler(llm_call_no_retry, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call_no_retry, DummyOutputSchema, region)
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = None
@@ -571,13 +578,12 @@ class TestStructuredReask:
     def test_query_none_with_retry_succeeds(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When invoke returns None then valid result, reask recovers."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
-        valid_result = DummyOutputSchema(field1="ok", field2=1)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
+        valid_result = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.side_effect = [None, valid_result]
@@ -595,13 +601,12 @@ class TestStructuredReask:
     def test_query_validation_error_with_retry_succeeds(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When invoke raises ValidationError then returns valid, reask recovers."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
-        valid_result = DummyOutputSchema(field1="ok", field2=1)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
+        valid_result = _EXPECTED_STRUCTURED
 
         # Create a real ValidationError by trying to validate bad data
         try:
@@ -624,12 +629,11 @@ class TestStructuredReask:
     def test_query_exhausts_reask_none(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When all attempts return None, raises OutputParserException."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = None
@@ -642,12 +646,11 @@ class TestStructuredReask:
     def test_query_exhausts_reask_validation_error(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When all attempts raise ValidationError, re-raises the last one."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
 
         try:
             DummyOutputSchema(field1=123, field2="not_an_int")
@@ -664,13 +667,12 @@ class TestStructuredReask:
     def test_reask_messages_accumulate(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Each reask appends a new message, so they accumulate."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
-        valid_result = DummyOutputSchema(field1="ok", field2=1)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
+        valid_result = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.side_effect = [None, None, valid_result]
@@ -684,6 +686,79 @@ class TestStructuredReask:
         assert len(reask_msgs) == 2
 
 
+class TestResponseCache:
+    """Test cases for the opt-in exact-match response cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_response_cache(self) -> Iterator[None]:
+        """Start each test with an empty cache and leave none behind for later tests."""
+        LangChainHandler._response_cache.clear()
+        yield
+        LangChainHandler._response_cache.clear()
+
+    @pytest.fixture
+    def cached_llm_call(self, llm_call: LLMCall) -> LLMCall:
+        """LLMCall with response caching enabled."""
+        return llm_call.model_copy(update={"cache_responses": True})
+
+    def test_cache_disabled_by_default(self, llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock) -> None:
+        """Repeated queries hit the model when caching is not enabled."""
+        handler = LangChainHandler(llm_call, region)
+
+        with patch.object(LangChainHandler, "chain") as mock_chain:
+            mock_chain.invoke.return_value = "Expected response"
+            handler.query(question="Same question?")
+            handler.query(question="Same question?")
+
+        assert mock_chain.invoke.call_count == 2
+        assert LangChainHandler._response_cache == {}
+
+    def test_repeated_query_served_from_cache(
+        self, cached_llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock
+    ) -> None:
+        """Identical queries across handler instances invoke the model once."""
+        with patch.object(LangChainHandler, "chain") as mock_chain:
+            mock_chain.invoke.return_value = "Expected response"
+            first = LangChainHandler(cached_llm_call, region).query(question="Same question?")
+            second = LangChainHandler(cached_llm_call, region).query(question="Same question?")
+            LangChainHandler(cached_llm_call, region).query(question="Different question?")
+
+        assert first == second == "Expected response"
+        assert mock_chain.invoke.call_count == 2
+
+    def test_structured_result_cached_only_on_success(
+        self, cached_llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock
+    ) -> None:
+        """Failed structured queries are not cached; the next successful one is."""
+        handler = StructuredLangChainHandler(cached_llm_call, DummyOutputSchema, region)
+
+        with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
+            mock_chain.invoke.side_effect = [None, _EXPECTED_STRUCTURED]
+            with pytest.raises(OutputParserException):
+                handler.query(question="Structured?")
+            assert handler.query(question="Structured?") == _EXPECTED_STRUCTURED
+            assert handler.query(question="Structured?") == _EXPECTED_STRUCTURED
+
+        assert mock_chain.invoke.call_count == 2
+
+    def test_cached_structured_result_is_copied(
+        self, cached_llm_call: LLMCall, region: AWSRegion, mock_bedrock_client: MagicMock
+    ) -> None:
+        """Mutating a returned structured result does not change later cache hits."""
+        handler = StructuredLangChainHandler(cached_llm_call, DummyOutputSchema, region)
+
+        with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
+            mock_chain.invoke.return_value = DummyOutputSchema(field1="test", field2=42)
+            first = handler.query(question="Structured?")
+            first.field1 = "changed"
+            second = handler.query(question="Structured?")
+            second.field2 = 0
+
+            assert handler.query(question="Structured?") == _EXPECTED_STRUCTURED
+
+        assert mock_chain.invoke.call_count == 1
+
+
 class TestGeminiLangChainHandler:
 
     @pytest.fixture
@@ -738,10 +813,6 @@ class TestGeminiStructuredHandler:
     def gemini_model_id(self) -> GeminiModelID:
         return GeminiModelID.GEMINI_3_FLASH_PREVIEW
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     @pytest.fixture
     def gemini_llm_call(self, system_prompt: str, gemini_model_id: GeminiModelID) -> LLMCall:
         return LLMCall(
@@ -750,22 +821,22 @@ class TestGeminiStructuredHandler:
         )
 
     def test_structured_init_with_gemini(
-        self, gemini_llm_call: LLMCall, output_schema: type[DummyOutputSchema], mock_gemini_client: MagicMock
+        self, gemini_llm_call: LLMCall, mock_gemini_client: MagicMock
     ) -> None:
-        handler = StructuredLangChainHandler(gemini_llm_call, output_schema)
-        assert handler.output_schema == output_schema
+        handler = StructuredLangChainHandler(gemini_llm_call, DummyOutputSchema)
+        assert handler.output_schema == DummyOutputSchema
         mock_gemini_client.assert_called_once_with(
             model=gemini_llm_call.model_id.value,
             temperature=gemini_llm_call.temp,
         )
         mock_instance = mock_gemini_client.return_value
-        mock_instance.with_structured_output.assert_called_once_with(output_schema)
+        mock_instance.with_structured_output.assert_called_once_with(DummyOutputSchema)
 
     def test_structured_query_with_image_gemini_format(
-        self, gemini_llm_call: LLMCall, output_schema: type[DummyOutputSchema], mock_gemini_client: MagicMock
+        self, gemini_llm_call: LLMCall, mock_gemini_client: MagicMock
     ) -> None:
-        handler = StructuredLangChainHandler(gemini_llm_call, output_schema)
-        expected_output = DummyOutputSchema(field1="gemini_result", field2=42)
+        handler = StructuredLangChainHandler(gemini_llm_call, DummyOutputSchema)
+        expected_output = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.return_value = expected_output
@@ -785,10 +856,6 @@ class TestTransportRetry:
     Transport retry is handled by with_retry on the client, not the reask loop.
     """
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     @pytest.fixture
     def llm_call_no_retry(self, system_prompt: str, model_id: ClaudeModelID) -> LLMCall:
         return LLMCall(
@@ -799,12 +866,11 @@ class TestTransportRetry:
     def test_transport_error_propagates(
         self,
         llm_call_no_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """Transport errors are not caught by the reask loop — they propagate directly."""
-        handler = StructuredLangChainHandler(llm_call_no_retry, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call_no_retry, DummyOutputSchema, region)
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.side_effect = RuntimeError("network error")
@@ -817,10 +883,6 @@ class TestTransportRetry:
 class TestConfigureEdgeCases:
     """Test cases for initialization edge cases and configuration branches."""
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     def test_structured_handler_falls_back_to_bind_tools(
         self,
         system_prompt: str,
@@ -905,21 +967,16 @@ class TestConfigureEdgeCases:
 class TestStructuredQueryWithImageException:
     """Test the exception logging path in StructuredLangChainHandler.query_with_image."""
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     def test_query_with_image_logs_and_reraises_exception(
         self,
         system_prompt: str,
         model_id: ClaudeModelID,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When query fails inside query_with_image, the exception is logged and re-raised."""
         llm_call = LLMCall(system_prompt_tmplt=system_prompt, model_id=model_id)
-        handler = StructuredLangChainHandler(llm_call, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call, DummyOutputSchema, region)
 
         with (
             patch.object(StructuredLangChainHandler, "chain") as mock_chain,
@@ -1038,10 +1095,6 @@ class TestRetryConfiguration:
 class TestOutputParserExceptionReask:
     """Test that OutputParserException triggers reask (not naive retry)."""
 
-    @pytest.fixture
-    def output_schema(self) -> type[DummyOutputSchema]:
-        return DummyOutputSchema
-
     @pytest.fixture
     def llm_call_with_retry(self, system_prompt: str, model_id: ClaudeModelID) -> LLMCall:
         return LLMCall(
@@ -1053,13 +1106,12 @@ class TestOutputParserExceptionReask:
     def test_output_parser_exception_triggers_reask(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """OutputParserException is a reask exception — error feedback is appended."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
-        valid_result = DummyOutputSchema(field1="recovered", field2=1)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
+        valid_result = _EXPECTED_STRUCTURED
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.side_effect = [
@@ -1081,12 +1133,11 @@ class TestOutputParserExceptionReask:
     def test_output_parser_exception_exhausted_reraises(
         self,
         llm_call_with_retry: LLMCall,
-        output_schema: type[DummyOutputSchema],
         region: AWSRegion,
         mock_bedrock_client: MagicMock,
     ) -> None:
         """When all attempts raise OutputParserException, re-raises the last one."""
-        handler = StructuredLangChainHandler(llm_call_with_retry, output_schema, region)
+        handler = StructuredLangChainHandler(llm_call_with_retry, DummyOutputSchema, region)
 
         with patch.object(StructuredLangChainHandler, "chain") as mock_chain:
             mock_chain.invoke.side_effect = OutputParserException("persistent parse error")
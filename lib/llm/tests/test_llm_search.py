@@ -1,4 +1,5 @@
 # ruff: noqa: E402
+import json
 import os
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wms.settings")
@@ -20,6 +21,7 @@ from schemas.llm_search import (
     ItemLocation,
     ItemSearchCandidate,
     ItemSearchCandidates,
+    ItemSearchInput,
 )
 
 
@@ -439,3 +441,43 @@ def test_find_item_location_orchestration(monkeypatch):
 
     # Verify result is still correct
     assert result3 == mock_location
+
+
+def test_item_location_str():
+    """Test ItemLocation string rendering."""
+    location = ItemLocation(item_name="Hammer", unit_name="Toolbox", confidence="High", additional_info="info")
+
+    assert str(location) == "Item: Hammer\nUnit: Toolbox\nConfidence: High"
+
+
+def test_item_search_input_to_prompt_replaces_image():
+    """Test that to_prompt emits a marker instead of the base64 image payload."""
+    search_input = ItemSearchInput(name="Hammer", description="Claw hammer", unit_name="Toolbox", image="aGVsbG8=")
+
+    assert json.loads(search_input.to_prompt()) == {
+        "name": "Hammer",
+        "description": "Claw hammer",
+        "unit_name": "Toolbox",
+        "image": "[Image provided below]",
+    }
+    assert json.loads(search_input.to_prompt(exclude_fields=["image", "description"])) == {
+        "name": "Hammer",
+        "unit_name": "Toolbox",
+    }
+    assert search_input.image == "aGVsbG8="
+
+
+def test_item_search_input_to_prompt_without_image():
+    """Test that to_prompt leaves a missing image as null."""
+    search_input = ItemSearchInput(name="Hammer", description="Claw hammer", unit_name="Toolbox")
+
+    assert json.loads(search_input.to_prompt())["image"] is None
+
+
+def test_item_search_input_to_prompt_bytes_matches_to_prompt():
+    """Test that to_prompt_bytes is the UTF-8 encoding of to_prompt."""
+    search_input = ItemSearchInput(name="Café tin", description="Tea", unit_name="Pantry", image="aGVsbG8=")
+
+    assert isinstance(search_input.to_prompt_bytes(), bytes)
+    assert search_input.to_prompt_bytes() == search_input.to_prompt().encode()
+    assert search_input.to_prompt_bytes(exclude_fields=["image"]) == search_input.to_prompt(exclude_fields=["image"]).encode()
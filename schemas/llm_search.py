@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 
 class ItemLocation(BaseModel):
@@ -55,13 +55,18 @@ class ItemSearchInput(BaseModel):
     unit_name: str
     image: str | None = None
 
+    @field_serializer("image")
+    def serialize_image(self, image: str | None) -> str | None:
+        """Serialize the base64 image as a placeholder marker so it is not inlined into prompts."""
+        return None if image is None else "[Image provided below]"
+
+    def to_prompt_bytes(self, exclude_fields: None | list[str] = None) -> bytes:
+        """Format this ItemSearchInput as UTF-8 encoded JSON, optionally excluding fields by property name.
+
+        Returns the serializer's raw bytes, for callers writing the prompt to a file or request body.
+        """
+        return self.__pydantic_serializer__.to_json(self, exclude=set(exclude_fields or ()))
+
     def to_prompt(self, exclude_fields: None | list[str] = None) -> str:
         """Format this ItemSearchInput for prompt insertion as a JSON string, optionally excluding fields by property name."""
-        exclude_fields = set(exclude_fields or [])
-        data = self.model_dump(exclude=exclude_fields)
-        if "image" not in exclude_fields and data.get("image") is not None:
-            data["image"] = "[Image provided below]"
-        # Create a new ItemSearchInput instance with modified data
-        prompt_model = ItemSearchInput(**data)
-        # Return JSON string from the new instance, excluding original excluded fields
-        return prompt_model.model_dump_json(exclude=exclude_fields)
+        return self.to_prompt_bytes(exclude_fields).decode()
@@ -2,12 +2,31 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import Callable, Optional
 from unittest.mock import Mock
 
 import pytest
+from django.conf import settings
+from django.test import override_settings
 
 from core.models import Item, Location, Unit, WMSUser
+from tests.helpers import SharedHierarchy
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_password_hasher():
+    """Hash test passwords with MD5 instead of the deliberately slow PBKDF2 default."""
+    with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def in_memory_media_storage():
+    """Keep uploaded files in memory instead of writing them to disk or S3."""
+    storages = {**settings.STORAGES, "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"}}
+    with override_settings(STORAGES=storages):
+        yield
 
 
 @pytest.fixture
@@ -120,6 +139,76 @@ def item(user: WMSUser, standalone_unit: Unit) -> Item:
     )
 
 
+# Enough pooled users for the test that needs the most at once
+USER_POOL_SIZE = 2
+
+
+@pytest.fixture(scope="session")
+def user_pool(django_db_setup, django_db_blocker) -> Iterator[list[WMSUser]]:
+    """Insert a few users once per session, in one query and without password hashing.
+
+    Every test gets the same rows; anything a test attaches to them is rolled
+    back with its transaction. The users are deleted after the session. The
+    passwords are unusable, so log in with ``client.force_login``.
+    """
+    users = [WMSUser(email=f"pooled{i}@example.com") for i in range(USER_POOL_SIZE)]
+    for pooled in users:
+        pooled.set_unusable_password()
+    with django_db_blocker.unblock():
+        # Clear rows left in a reused database by an interrupted run
+        WMSUser.objects.filter(email__in=[pooled.email for pooled in users]).delete()
+        users = WMSUser.objects.bulk_create(users)
+    yield users
+    with django_db_blocker.unblock():
+        # Cascades to anything committed against the pool, such as module-scoped units
+        WMSUser.objects.filter(pk__in=[pooled.pk for pooled in users]).delete()
+
+
+@pytest.fixture(scope="session")
+def shared_hierarchy(django_db_setup, django_db_blocker) -> Iterator[SharedHierarchy]:
+    """Create a user, location and unit hierarchy once for the whole session.
+
+    The rows are committed outside any test transaction, so each test's
+    rollback leaves them in place, and are deleted after the session.
+    Tests that use this fixture must not update or delete these rows;
+    anything they create is rolled back as usual. Class-scoped fixtures may
+    commit extra units for the owner if they delete them afterwards; the
+    owner's cascade delete also clears any left by an interrupted run.
+    Mirrors the per-test ``user``, ``location``, ``standalone_unit``,
+    ``unit_in_location`` and ``nested_unit`` fixtures, except that the
+    standalone unit always contains the nested unit.
+    """
+    email = "hierarchy-owner@example.com"
+    with django_db_blocker.unblock():
+        # Clear rows left in a reused database by an interrupted run
+        WMSUser.objects.filter(email=email).delete()
+        user = WMSUser.objects.create_user(
+            email=email,
+            password="testpass123",
+            has_completed_onboarding=True,
+        )
+        location = Location.objects.create(
+            user=user,
+            name="My House",
+            description="Test location",
+            address="123 Test St"
+        )
+        standalone_unit, unit_in_location = Unit.objects.bulk_create([
+            Unit(user=user, name="Storage Bin", description="Standalone test unit"),
+            Unit(user=user, name="Closet", description="Test unit in location", location=location),
+        ])
+        nested_unit = Unit.objects.create(
+            user=user,
+            name="Drawer",
+            description="Drawer inside storage bin",
+            parent_unit=standalone_unit
+        )
+    yield SharedHierarchy(user, location, standalone_unit, unit_in_location, nested_unit)
+    with django_db_blocker.unblock():
+        # Cascades to the location and units
+        user.delete()
+
+
 @pytest.fixture
 def mock_path() -> Callable[[bool, Optional[bytes]], Mock]:
     """Create a mock Path that supports / operator and context manager.
@@ -0,0 +1,17 @@
+"""Plain helpers shared by test modules and fixtures."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from core.models import Location, Unit, WMSUser
+
+
+class SharedHierarchy(NamedTuple):
+    """Read-mostly user, location and units created once per test session."""
+
+    user: WMSUser
+    location: Location
+    standalone_unit: Unit
+    unit_in_location: Unit
+    nested_unit: Unit
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from io import BytesIO
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -12,6 +12,9 @@ from PIL import Image
 from core.upload_paths import MAX_FILENAME_LENGTH, user_item_image_upload_path
 from core.views import ImageValidationError, _validate_image_upload
 
+# Filename whose stem is well past MAX_FILENAME_LENGTH
+LONG_FILENAME = "a" * 100 + ".jpg"
+
 
 def _build_image_file(image_format: str = "PNG", size: tuple[int, int] = (64, 64)) -> SimpleUploadedFile:
     """Create an in-memory image file for testing."""
@@ -89,41 +92,43 @@ def test_validate_image_upload_rejects_corrupted_file() -> None:
 # =============================================================================
 
 
+def _upload_item(user_id: int = 1) -> SimpleNamespace:
+    """Build a stand-in Item exposing only the ``unit.user.id`` chain the upload path reads."""
+    return SimpleNamespace(unit=SimpleNamespace(user=SimpleNamespace(id=user_id)))
+
+
+@pytest.fixture(scope="module")
+def upload_item() -> SimpleNamespace:
+    """Stand-in Item owned by user 1, shared by the upload path tests."""
+    return _upload_item()
+
+
 def test_user_item_image_upload_path_includes_user_id() -> None:
     """Upload path should include the user ID from the item's unit owner."""
-    mock_user = Mock(id=42)
-    mock_unit = Mock(user=mock_user)
-    mock_item = Mock(unit=mock_unit)
-
-    path = user_item_image_upload_path(mock_item, "test.jpg")
+    path = user_item_image_upload_path(_upload_item(user_id=42), "test.jpg")
 
     assert path.startswith("users/42/item_images/")
 
 
-def test_user_item_image_upload_path_preserves_extension() -> None:
+@pytest.mark.parametrize("filename, extension", [
+    ("photo.jpg", ".jpg"),
+    ("image.png", ".png"),
+    ("picture.jpeg", ".jpeg"),
+])
+def test_user_item_image_upload_path_preserves_extension(
+    upload_item: SimpleNamespace, filename: str, extension: str
+) -> None:
     """Upload path should preserve the original file extension."""
-    mock_user = Mock(id=1)
-    mock_unit = Mock(user=mock_user)
-    mock_item = Mock(unit=mock_unit)
-
-    path_jpg = user_item_image_upload_path(mock_item, "photo.jpg")
-    path_png = user_item_image_upload_path(mock_item, "image.png")
-    path_jpeg = user_item_image_upload_path(mock_item, "picture.jpeg")
+    path = user_item_image_upload_path(upload_item, filename)
 
-    assert path_jpg.endswith(".jpg")
-    assert path_png.endswith(".png")
-    assert path_jpeg.endswith(".jpeg")
+    assert path.endswith(extension)
 
 
-def test_user_item_image_upload_path_generates_unique_filenames() -> None:
+def test_user_item_image_upload_path_generates_unique_filenames(upload_item: SimpleNamespace) -> None:
     """Multiple calls with the same filename should generate unique paths."""
-    mock_user = Mock(id=1)
-    mock_unit = Mock(user=mock_user)
-    mock_item = Mock(unit=mock_unit)
-
-    path1 = user_item_image_upload_path(mock_item, "image.jpg")
-    path2 = user_item_image_upload_path(mock_item, "image.jpg")
-    path3 = user_item_image_upload_path(mock_item, "image.jpg")
+    path1 = user_item_image_upload_path(upload_item, "image.jpg")
+    path2 = user_item_image_upload_path(upload_item, "image.jpg")
+    path3 = user_item_image_upload_path(upload_item, "image.jpg")
 
     # All paths should be different due to UUID prefix
     assert path1 != path2
@@ -136,29 +141,20 @@ def test_user_item_image_upload_path_generates_unique_filenames() -> None:
     assert path3.endswith("_image.jpg")
 
 
-def test_user_item_image_upload_path_truncates_long_filenames() -> None:
+def test_user_item_image_upload_path_truncates_long_filenames(upload_item: SimpleNamespace) -> None:
     """Very long filenames should be truncated to prevent path issues."""
-    mock_user = Mock(id=1)
-    mock_unit = Mock(user=mock_user)
-    mock_item = Mock(unit=mock_unit)
-
-    long_filename = "a" * 100 + ".jpg"
-    path = user_item_image_upload_path(mock_item, long_filename)
+    path = user_item_image_upload_path(upload_item, LONG_FILENAME)
 
     # Extract just the filename part (after item_images/)
-    filename_part = path.split("/")[-1]
+    filename_part = path.rpartition("/")[2]
     # Should be uuid (8 chars) + _ + truncated name (MAX_FILENAME_LENGTH) + .jpg
     # Total should be reasonable (not 100+ chars)
     assert len(filename_part) <= 8 + 1 + MAX_FILENAME_LENGTH + 4
 
 
-def test_user_item_image_upload_path_handles_complex_filenames() -> None:
+def test_user_item_image_upload_path_handles_complex_filenames(upload_item: SimpleNamespace) -> None:
     """Filenames with spaces and special characters should be handled safely."""
-    mock_user = Mock(id=1)
-    mock_unit = Mock(user=mock_user)
-    mock_item = Mock(unit=mock_unit)
-
-    path = user_item_image_upload_path(mock_item, "my photo (2024).jpg")
+    path = user_item_image_upload_path(upload_item, "my photo (2024).jpg")
 
     # Should still generate a valid path
     assert path.startswith("users/1/item_images/")
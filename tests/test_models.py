@@ -1,11 +1,12 @@
 """Tests for core/models.py custom logic."""
 
 import base64
+from collections.abc import Iterator
 from decimal import Decimal
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 from core.models import (
     CATEGORY_2_UNITS,
@@ -19,7 +20,13 @@ from core.models import (
     UnitSharedAccess,
     UNIT_2_NAME,
     WMSUser,
+    _qr_slug,
 )
+from tests.helpers import SharedHierarchy
+
+# Image payload for to_search_input tests and its expected base64 encoding
+FAKE_IMAGE_DATA = b"fake image data"
+FAKE_IMAGE_B64 = base64.b64encode(FAKE_IMAGE_DATA).decode("ascii")
 
 
 class TestWMSUserManager:
@@ -90,18 +97,23 @@ class TestWMSUserManager:
 class TestUnitConstraints:
     """Tests for Unit model CheckConstraints."""
 
-    @pytest.mark.django_db(transaction=True)
-    def test_unit_cannot_have_both_location_and_parent_unit(self, user, location, standalone_unit):
-        """Test that a unit cannot have both location and parent_unit set."""
-        with pytest.raises(IntegrityError):
-            Unit.objects.create(
-                user=user,
-                name="Invalid Unit",
-                location=location,
-                parent_unit=standalone_unit
-            )
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("fixture_fields, fields", [
+        pytest.param({"location": "location", "parent_unit": "standalone_unit"}, {}, id="location_and_parent_unit"),
+        pytest.param({}, {"length": 10.0, "width": None, "height": None, "dimensions_unit": None}, id="partial_dimensions"),
+    ])
+    def test_unit_constraints_reject(self, request: pytest.FixtureRequest, user, fixture_fields, fields):
+        """Test that a unit with both location and parent_unit, or only some dimensions, is rejected.
 
-    @pytest.mark.django_db(transaction=True)
+        ``fixture_fields`` maps model fields to fixture names, resolved only for the case that needs them.
+        """
+        fields = {**fields, **{field: request.getfixturevalue(name) for field, name in fixture_fields.items()}}
+
+        # The savepoint keeps the failed INSERT from breaking the test transaction
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Unit.objects.create(user=user, name="Invalid Unit", **fields)
+
+    @pytest.mark.django_db
     def test_unit_can_have_location_only(self, user, location):
         """Test that a unit can have location without parent_unit."""
         unit = Unit.objects.create(
@@ -114,7 +126,7 @@ class TestUnitConstraints:
         assert unit.location == location
         assert unit.parent_unit is None
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_unit_can_have_parent_unit_only(self, user, standalone_unit):
         """Test that a unit can have parent_unit without location."""
         unit = Unit.objects.create(
@@ -127,7 +139,7 @@ class TestUnitConstraints:
         assert unit.parent_unit == standalone_unit
         assert unit.location is None
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_unit_can_have_neither_location_nor_parent(self, user):
         """Test that a unit can be standalone (no location or parent_unit)."""
         unit = Unit.objects.create(
@@ -140,20 +152,7 @@ class TestUnitConstraints:
         assert unit.location is None
         assert unit.parent_unit is None
 
-    @pytest.mark.django_db(transaction=True)
-    def test_unit_dimensions_all_or_nothing_rejects_partial(self, user):
-        """Test that partial dimensions (only some fields) are rejected."""
-        with pytest.raises(IntegrityError):
-            Unit.objects.create(
-                user=user,
-                name="Invalid Dimensions",
-                length=10.0,  # Only length provided
-                width=None,
-                height=None,
-                dimensions_unit=None
-            )
-
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_unit_dimensions_all_or_nothing_accepts_all(self, user):
         """Test that complete dimensions are accepted."""
         unit = Unit.objects.create(
@@ -170,7 +169,7 @@ class TestUnitConstraints:
         assert unit.height == 6.0
         assert unit.dimensions_unit == "in"
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_unit_dimensions_all_or_nothing_accepts_none(self, user):
         """Test that no dimensions (all None) is accepted."""
         unit = Unit.objects.create(
@@ -216,7 +215,7 @@ class TestLocationPromoteToUnit:
         assert not Location.objects.filter(id=location_id).exists()
 
     @pytest.mark.django_db
-    def test_promote_location_with_child_units(self, user: WMSUser):
+    def test_promote_location_with_child_units(self, user: WMSUser, django_assert_num_queries):
         """Test promoting a location with child units reassigns them."""
         location = Location.objects.create(
             user=user,
@@ -239,15 +238,17 @@ class TestLocationPromoteToUnit:
         # Promote location to unit
         unit = location.promote_to_unit()
 
-        # Refresh child units from database
-        child1.refresh_from_db()
-        child2.refresh_from_db()
+        # Re-fetch both child units from database in one query, with their new parent joined
+        child1, child2 = Unit.objects.select_related("parent_unit").filter(
+            pk__in=[child1.pk, child2.pk]
+        ).order_by("name")
 
         # Verify children now have parent_unit set to new unit
-        assert child1.parent_unit == unit
-        assert child1.location is None
-        assert child2.parent_unit == unit
-        assert child2.location is None
+        with django_assert_num_queries(0):
+            assert child1.parent_unit == unit
+            assert child1.location is None
+            assert child2.parent_unit == unit
+            assert child2.location is None
 
     @pytest.mark.django_db
     def test_can_promote_to_unit_always_true(self, location: Location):
@@ -255,9 +256,61 @@ class TestLocationPromoteToUnit:
         assert location.can_promote_to_unit() is True
 
 
-class TestUnitHierarchy:
+class SharedHierarchyFixtures:
+    """Serve the hierarchy fixtures from the session-scoped ``shared_hierarchy``.
+
+    Tests in subclasses only read these rows, so they skip the per-test INSERTs.
+    Units a test creates on top of them are rolled back with the test transaction.
+    """
+
+    @pytest.fixture
+    def user(self, shared_hierarchy: SharedHierarchy) -> WMSUser:
+        """Owner of the shared hierarchy."""
+        return shared_hierarchy.user
+
+    @pytest.fixture
+    def location(self, shared_hierarchy: SharedHierarchy) -> Location:
+        """Shared location."""
+        return shared_hierarchy.location
+
+    @pytest.fixture
+    def standalone_unit(self, shared_hierarchy: SharedHierarchy) -> Unit:
+        """Shared top-level unit; contains ``nested_unit``."""
+        return shared_hierarchy.standalone_unit
+
+    @pytest.fixture
+    def unit_in_location(self, shared_hierarchy: SharedHierarchy) -> Unit:
+        """Shared unit inside ``location``."""
+        return shared_hierarchy.unit_in_location
+
+    @pytest.fixture
+    def nested_unit(self, shared_hierarchy: SharedHierarchy) -> Unit:
+        """Shared leaf unit inside ``standalone_unit``."""
+        return shared_hierarchy.nested_unit
+
+
+class TestUnitHierarchy(SharedHierarchyFixtures):
     """Tests for Unit hierarchy navigation methods."""
 
+    @pytest.fixture(scope="class")
+    def unit_tree(self, shared_hierarchy: SharedHierarchy, django_db_blocker) -> Iterator[tuple[Unit, Unit, Unit]]:
+        """Three-level Garage > Workbench > Toolbox chain shared by the class.
+
+        Owned by the shared hierarchy's user, committed once and deleted
+        afterwards; tests must only read it.
+
+        Yields:
+            The root, middle and leaf units.
+        """
+        owner = shared_hierarchy.user
+        with django_db_blocker.unblock():
+            root = Unit.objects.create(user=owner, name="Garage")
+            middle = Unit.objects.create(user=owner, name="Workbench", parent_unit=root)
+            leaf = Unit.objects.create(user=owner, name="Toolbox", parent_unit=middle)
+        yield root, middle, leaf
+        with django_db_blocker.unblock():
+            Unit.objects.filter(pk__in=[root.pk, middle.pk, leaf.pk]).delete()
+
     @pytest.mark.django_db
     def test_get_container_returns_location(self, unit_in_location: Unit, location: Location):
         """Test get_container returns location when unit is in location."""
@@ -298,19 +351,17 @@ class TestUnitHierarchy:
         """Test get_full_path for unit in location."""
         unit = Unit.objects.create(
             user=user,
-            name="Workbench",
+            name="Pegboard",
             location=location
         )
 
         # Location name is included at the beginning of path
-        assert unit.get_full_path() == "My House > Workbench"
+        assert unit.get_full_path() == "My House > Pegboard"
 
     @pytest.mark.django_db
-    def test_get_full_path_nested_units(self, user: WMSUser):
+    def test_get_full_path_nested_units(self, unit_tree: tuple[Unit, Unit, Unit]):
         """Test get_full_path for multi-level nested units."""
-        root = Unit.objects.create(user=user, name="Garage")
-        middle = Unit.objects.create(user=user, name="Workbench", parent_unit=root)
-        leaf = Unit.objects.create(user=user, name="Toolbox", parent_unit=middle)
+        _, _, leaf = unit_tree
 
         assert leaf.get_full_path() == "Garage > Workbench > Toolbox"
 
@@ -320,11 +371,9 @@ class TestUnitHierarchy:
         assert standalone_unit.get_root_unit() == standalone_unit
 
     @pytest.mark.django_db
-    def test_get_root_unit_returns_top_level(self, user: WMSUser):
+    def test_get_root_unit_returns_top_level(self, unit_tree: tuple[Unit, Unit, Unit]):
         """Test get_root_unit returns the topmost unit in hierarchy."""
-        root = Unit.objects.create(user=user, name="Root")
-        middle = Unit.objects.create(user=user, name="Middle", parent_unit=root)
-        leaf = Unit.objects.create(user=user, name="Leaf", parent_unit=middle)
+        root, middle, leaf = unit_tree
 
         assert leaf.get_root_unit() == root
         assert middle.get_root_unit() == root
@@ -338,17 +387,45 @@ class TestUnitHierarchy:
         assert ancestors[0] == standalone_unit
 
     @pytest.mark.django_db
-    def test_get_ancestors_nested_units(self, user: WMSUser):
+    def test_get_ancestors_nested_units(self, unit_tree: tuple[Unit, Unit, Unit], django_assert_num_queries):
         """Test get_ancestors for nested units returns full hierarchy."""
-        root = Unit.objects.create(user=user, name="Root")
-        middle = Unit.objects.create(user=user, name="Middle", parent_unit=root)
-        leaf = Unit.objects.create(user=user, name="Leaf", parent_unit=middle)
+        root, middle, _ = unit_tree
+        # A fresh instance, so no parent is loaded or cached yet
+        leaf = Unit.objects.get(pk=unit_tree[2].pk)
 
-        ancestors = leaf.get_ancestors()
+        # The whole parent chain is fetched in one query, whatever its depth
+        with django_assert_num_queries(1):
+            ancestors = leaf.get_ancestors()
 
         assert len(ancestors) == 3
         assert ancestors == [root, middle, leaf]
 
+    @pytest.mark.django_db
+    def test_get_ancestor_path_reuses_cached_chain(
+        self, unit_tree: tuple[Unit, Unit, Unit], django_assert_num_queries
+    ):
+        """Test get_full_path and get_ancestor_path share one chain query."""
+        leaf = Unit.objects.get(pk=unit_tree[2].pk)
+
+        with django_assert_num_queries(1):
+            assert leaf.get_full_path() == "Garage > Workbench > Toolbox"
+            assert leaf.get_ancestor_path() == "Garage > Workbench"
+
+    @pytest.mark.django_db
+    def test_get_ancestor_path_uses_selected_parents(
+        self, unit_tree: tuple[Unit, Unit, Unit], django_assert_num_queries
+    ):
+        """Test parents loaded with select_related are used instead of querying."""
+        leaf = Unit.objects.select_related("parent_unit__parent_unit").get(pk=unit_tree[2].pk)
+
+        with django_assert_num_queries(0):
+            assert leaf.get_ancestor_path() == "Garage > Workbench"
+
+    @pytest.mark.django_db
+    def test_get_ancestor_path_standalone_unit(self, standalone_unit: Unit):
+        """Test get_ancestor_path is empty for a standalone unit."""
+        assert standalone_unit.get_ancestor_path() == ""
+
     @pytest.mark.django_db
     def test_get_ancestors_includes_location(self, user: WMSUser, location: Location):
         """Test get_ancestors includes location at root."""
@@ -361,40 +438,51 @@ class TestUnitHierarchy:
         assert ancestors[1] == unit
 
     @pytest.mark.django_db
-    def test_get_descendants_no_children(self, standalone_unit: Unit):
+    def test_get_descendants_no_children(self, nested_unit: Unit):
         """Test get_descendants for unit with no children."""
-        descendants = standalone_unit.get_descendants()
+        descendants = nested_unit.get_descendants()
 
         assert descendants == []
 
     @pytest.mark.django_db
-    def test_get_descendants_with_children(self, user: WMSUser, standalone_unit: Unit):
+    def test_get_descendants_with_children(
+        self, user: WMSUser, standalone_unit: Unit, nested_unit: Unit, django_assert_num_queries
+    ):
         """Test get_descendants returns all nested units."""
-        child1 = Unit.objects.create(user=user, name="Child1", parent_unit=standalone_unit)
-        child2 = Unit.objects.create(user=user, name="Child2", parent_unit=standalone_unit)
+        # Siblings share a parent, so they go in one INSERT; the grandchild needs child1's PK
+        child1, child2 = Unit.objects.bulk_create([
+            Unit(user=user, name="Child1", parent_unit=standalone_unit),
+            Unit(user=user, name="Child2", parent_unit=standalone_unit),
+        ])
         grandchild = Unit.objects.create(user=user, name="Grandchild", parent_unit=child1)
 
-        descendants = standalone_unit.get_descendants()
+        # The whole subtree is fetched in one query, whatever its depth
+        with django_assert_num_queries(1):
+            descendants = standalone_unit.get_descendants()
 
-        assert len(descendants) == 3
+        assert len(descendants) == 4
+        assert nested_unit in descendants
         assert child1 in descendants
         assert child2 in descendants
         assert grandchild in descendants
 
     @pytest.mark.django_db
-    def test_has_children_false_for_no_children(self, standalone_unit: Unit):
+    def test_has_children_false_for_no_children(self, nested_unit: Unit):
         """Test has_children returns False when no children."""
-        assert standalone_unit.has_children() is False
+        assert nested_unit.has_children() is False
 
     @pytest.mark.django_db
-    def test_has_children_true_with_children(self, user: WMSUser, standalone_unit: Unit):
+    def test_has_children_true_with_children(self, user: WMSUser, nested_unit: Unit, django_assert_num_queries):
         """Test has_children returns True when unit has children."""
-        Unit.objects.create(user=user, name="Child", parent_unit=standalone_unit)
+        Unit.objects.create(user=user, name="Child", parent_unit=nested_unit)
 
-        assert standalone_unit.has_children() is True
+        # An EXISTS-style probe stops at the first child instead of counting them all
+        with django_assert_num_queries(1) as ctx:
+            assert nested_unit.has_children() is True
+        assert "LIMIT 1" in ctx.captured_queries[0]["sql"].upper()
 
 
-class TestUnitAccessControl:
+class TestUnitAccessControl(SharedHierarchyFixtures):
     """Tests for Unit.user_has_access() method."""
 
     @pytest.mark.django_db
@@ -418,22 +506,6 @@ class TestUnitAccessControl:
 
         assert standalone_unit.user_has_access(other_user) is True
 
-    @pytest.mark.django_db
-    def test_no_transitive_access_through_parent_unit(self, user: WMSUser, other_user: WMSUser):
-        """Test that access to parent unit does NOT grant access to child."""
-        parent = Unit.objects.create(user=user, name="Parent")
-        child = Unit.objects.create(user=user, name="Child", parent_unit=parent)
-
-        # Grant access to parent
-        UnitSharedAccess.objects.create(
-            user=other_user,
-            unit=parent,
-            permission="read"
-        )
-
-        # Should NOT have access to child — sharing is explicit per unit
-        assert child.user_has_access(other_user) is False
-
     @pytest.mark.django_db
     def test_location_sharing_does_not_grant_unit_access(self, user: WMSUser, other_user: WMSUser, location: Location):
         """Test that LocationSharedAccess does NOT grant access to units within the location."""
@@ -449,22 +521,44 @@ class TestUnitAccessControl:
         # Should NOT have access to unit — location sharing only grants name visibility
         assert unit.user_has_access(other_user) is False
 
-    @pytest.mark.django_db
-    def test_no_transitive_access_multi_level(self, user: WMSUser, other_user: WMSUser):
-        """Test that access does NOT inherit through multiple levels of parent units."""
-        grandparent = Unit.objects.create(user=user, name="Grandparent")
-        parent = Unit.objects.create(user=user, name="Parent", parent_unit=grandparent)
-        child = Unit.objects.create(user=user, name="Child", parent_unit=parent)
+    @pytest.fixture(scope="class")
+    def shared_chain(
+        self, shared_hierarchy: SharedHierarchy, user_pool: list[WMSUser], django_db_blocker
+    ) -> Iterator[tuple[WMSUser, list[Unit]]]:
+        """Grandparent > parent > child units where only the grandparent is shared.
 
-        # Grant access only to grandparent
-        UnitSharedAccess.objects.create(
-            user=other_user,
-            unit=grandparent,
-            permission="read"
-        )
+        Owned by the shared hierarchy's user and shared with the first pooled
+        user. Committed once for the class and deleted afterwards; tests must
+        only read it.
 
-        # Should NOT have access to child — sharing is explicit per unit
-        assert child.user_has_access(other_user) is False
+        Yields:
+            The sharee and the units ordered from grandparent to child.
+        """
+        owner, sharee = shared_hierarchy.user, user_pool[0]
+        with django_db_blocker.unblock():
+            grandparent = Unit.objects.create(user=owner, name="Grandparent")
+            parent = Unit.objects.create(user=owner, name="Parent", parent_unit=grandparent)
+            child = Unit.objects.create(user=owner, name="Child", parent_unit=parent)
+            UnitSharedAccess.objects.create(user=sharee, unit=grandparent, permission="read")
+        yield sharee, [grandparent, parent, child]
+        with django_db_blocker.unblock():
+            # Cascades to the share
+            Unit.objects.filter(pk__in=[grandparent.pk, parent.pk, child.pk]).delete()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("depth, expected", [
+        (0, True),
+        (1, False),
+        (2, False),
+    ])
+    def test_no_transitive_access_through_parent_units(
+        self, shared_chain: tuple[WMSUser, list[Unit]], depth: int, expected: bool
+    ):
+        """Test that sharing a unit does NOT grant access to units nested under it, at any depth."""
+        sharee, chain = shared_chain
+
+        # Sharing is explicit per unit
+        assert chain[depth].user_has_access(sharee) is expected
 
 
 class TestUnitHelperMethods:
@@ -493,6 +587,14 @@ class TestUnitHelperMethods:
 
         assert filename == "unit_unit_qr.png"
 
+    def test_get_qr_filename_reuses_cached_slug(self):
+        """Test repeated get_qr_filename calls for the same name hit the slug cache."""
+        _qr_slug.cache_clear()
+        unit = Unit(name="Cached Name")
+
+        assert unit.get_qr_filename() == unit.get_qr_filename() == "cached-name_unit_qr.png"
+        assert _qr_slug.cache_info().hits == 1
+
     @pytest.mark.django_db
     def test_get_detail_path(self, standalone_unit: Unit):
         """Test get_detail_path returns correct URL path."""
@@ -506,9 +608,7 @@ class TestItemSave:
 
     @pytest.mark.django_db
     def test_item_save_raises_error_when_unit_is_none(self, user: WMSUser):
-        """Test that creating an item without a unit is blocked by database constraint."""
-        # Django ForeignKey descriptors prevent testing None check directly
-        # Instead, test that database constraint prevents saving without unit
+        """Test that saving an item without a unit is rejected before reaching the database."""
         item = Item(
             user=user,
             name="Test Item",
@@ -516,8 +616,8 @@ class TestItemSave:
         )
         item.unit_id = None  # Bypass descriptor by setting FK ID directly
 
-        # This will fail at database level due to NOT NULL constraint
-        with pytest.raises(Exception):  # IntegrityError or ValueError
+        # Item.save() reads self.unit, and the non-nullable FK descriptor raises on a missing unit
+        with pytest.raises(Item.unit.RelatedObjectDoesNotExist, match="Item has no unit"):
             item.save()
 
     @pytest.mark.django_db
@@ -604,9 +704,12 @@ class TestItemToSearchInput:
     """Tests for Item.to_search_input() method."""
 
     @pytest.mark.django_db
-    def test_to_search_input_without_image(self, item: Item):
+    def test_to_search_input_without_image(self, item: Item, django_assert_num_queries):
         """Test to_search_input for item without image."""
-        search_input = item.to_search_input()
+        # Fetching with its unit joined, the conversion needs no further queries
+        with django_assert_num_queries(1):
+            item = Item.objects.select_related("unit").get(pk=item.pk)
+            search_input = item.to_search_input()
 
         assert search_input.name == "Hammer"
         assert search_input.description == "Claw hammer"
@@ -614,13 +717,12 @@ class TestItemToSearchInput:
         assert search_input.image is None
 
     @pytest.mark.django_db
-    def test_to_search_input_with_image(self, user: WMSUser, standalone_unit: Unit):
+    def test_to_search_input_with_image(self, user: WMSUser, standalone_unit: Unit, django_assert_num_queries):
         """Test to_search_input for item with image encodes to base64."""
         # Create a simple test image
-        image_data = b"fake image data"
         image_file = SimpleUploadedFile(
             name="test_image.jpg",
-            content=image_data,
+            content=FAKE_IMAGE_DATA,
             content_type="image/jpeg"
         )
 
@@ -632,7 +734,9 @@ class TestItemToSearchInput:
             image=image_file
         )
 
-        search_input = item.to_search_input()
+        with django_assert_num_queries(1):
+            item = Item.objects.select_related("unit").get(pk=item.pk)
+            search_input = item.to_search_input()
 
         assert search_input.name == "Test Item"
         assert search_input.description == "Item with image"
@@ -640,8 +744,7 @@ class TestItemToSearchInput:
         assert search_input.image is not None
 
         # Verify base64 encoding
-        decoded = base64.b64decode(search_input.image)
-        assert decoded == image_data
+        assert search_input.image == FAKE_IMAGE_B64
 
     @pytest.mark.django_db
     def test_to_search_input_handles_missing_image_gracefully(self, user: WMSUser, standalone_unit: Unit):
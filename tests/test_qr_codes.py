@@ -2,67 +2,129 @@
 
 from __future__ import annotations
 
-from unittest import mock
+from collections.abc import Iterator
 
 import pytest
 from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import Client, RequestFactory
 from django.urls import reverse
 
+from core import models as core_models
+from core import utils as core_utils
 from core.models import Unit, UnitSharedAccess, WMSUser
-from core.utils import generate_unit_access_token, get_qr_code_file
+from core.utils import generate_unit_access_token, get_qr_code_bytes, get_qr_code_file
+from core.views import unit_qr_view
+
+# Access tokens sampled by the uniqueness test
+TOKEN_SAMPLE_SIZE = 20
+
+
+class DummyQR:
+    """Stand-in for a qrcode image that writes fixed bytes when saved as PNG."""
+
+    def save(self, buffer, format):  # noqa: ANN001 - qrcode interface
+        assert format == "PNG"
+        buffer.write(b"fake-qr")
+
+
+DUMMY_QR = DummyQR()
+
+# Names of the units the DB tests below look up, all owned by the first pooled user
+QR_UNIT_NAMES = ("Exercise Equipment", "!!!", "Garage", "Basement", "Pantry", "Office", "Attic")
+
+# Stand-in QR files returned by patched helpers, keyed by filename; the view seeks before reading
+FAKE_QR_FILES = {
+    name: ContentFile(b"qr-content", name=name)
+    for name in ("basement_unit_qr.png", "pantry_unit_qr.png", "office_unit_qr.png")
+}
+
+
+@pytest.fixture(scope="module")
+def qr_units(user_pool: list[WMSUser], django_db_blocker) -> Iterator[dict[str, Unit]]:
+    """Insert every unit this module needs in one query, keyed by name.
+
+    Committed for the module and deleted afterwards; tests must not modify the units.
+    """
+    with django_db_blocker.unblock():
+        units = Unit.objects.bulk_create([Unit(user=user_pool[0], name=name, description="desc") for name in QR_UNIT_NAMES])
+    yield {unit.name: unit for unit in units}
+    with django_db_blocker.unblock():
+        Unit.objects.filter(pk__in=[unit.pk for unit in units]).delete()
+
+
+@pytest.fixture
+def stub_get_qr_code(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Unit, str]]:
+    """Replace Unit.get_qr_code with a stub serving FAKE_QR_FILES by QR filename.
+
+    Returns:
+        The ``(unit, base_url)`` pairs the stub was called with.
+    """
+    calls: list[tuple[Unit, str]] = []
+
+    def fake_get_qr_code(self: Unit, *, base_url: str) -> ContentFile:
+        calls.append((self, base_url))
+        return FAKE_QR_FILES[self.get_qr_filename()]
+
+    monkeypatch.setattr(Unit, "get_qr_code", fake_get_qr_code)
+    return calls
 
 
 def test_generate_unit_access_token_produces_unique_urlsafe_tokens() -> None:
     """Token generator should return unique, URL-safe strings."""
-    samples = {generate_unit_access_token() for _ in range(100)}
+    # 128-bit tokens: any collision in a small sample means the generator is broken
+    samples = {generate_unit_access_token() for _ in range(TOKEN_SAMPLE_SIZE)}
 
-    assert len(samples) == 100
+    assert len(samples) == TOKEN_SAMPLE_SIZE
     assert all(isinstance(token, str) for token in samples)
-    assert all("/" not in token and "+" not in token for token in samples)
+    joined = "".join(samples)
+    assert "/" not in joined and "+" not in joined
     assert all(len(token) >= 22 for token in samples)
 
 
-def test_get_qr_code_file_wraps_image_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
-    """The QR code helper should serialize the generated image to a ContentFile."""
+def test_get_qr_code_bytes_renders_png(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The QR code helper should render the generated image to PNG bytes."""
+    calls: list[str] = []
+    monkeypatch.setattr(core_utils, "get_qr_code", lambda url: calls.append(url) or DUMMY_QR)
 
-    class DummyQR:
-        def save(self, buffer, format):  # noqa: ANN001 - qrcode interface
-            buffer.write(b"fake-qr")
+    assert get_qr_code_bytes("https://example.com/unit") == b"fake-qr"
+    assert calls == ["https://example.com/unit"]
 
-    mocked_qr = DummyQR()
 
-    with mock.patch("core.utils.get_qr_code", return_value=mocked_qr) as mocked_make:
-        content_file = get_qr_code_file("https://example.com/unit", filename="example.png")
+def test_get_qr_code_file_wraps_image_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The QR code file helper should wrap the rendered bytes in a named ContentFile."""
+    calls: list[str] = []
+    monkeypatch.setattr(core_utils, "get_qr_code_bytes", lambda url: calls.append(url) or b"fake-qr")
 
-    mocked_make.assert_called_once_with("https://example.com/unit")
+    content_file = get_qr_code_file("https://example.com/unit", filename="example.png")
+
+    assert calls == ["https://example.com/unit"]
     assert isinstance(content_file, ContentFile)
     assert content_file.name == "example.png"
     assert content_file.read() == b"fake-qr"
 
 
 @pytest.mark.django_db
-def test_get_qr_filename_slugifies_unit_name() -> None:
+def test_get_qr_filename_slugifies_unit_name(qr_units: dict[str, Unit]) -> None:
     """Unit QR filenames should slugify the unit name and add a suffix."""
-    user = WMSUser.objects.create_user(email="owner@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=user, name="Exercise Equipment", description="desc")
+    storage_unit = qr_units["Exercise Equipment"]
 
     assert storage_unit.get_qr_filename() == "exercise-equipment_unit_qr.png"
 
 
 @pytest.mark.django_db
-def test_get_qr_filename_falls_back_when_slug_empty() -> None:
+def test_get_qr_filename_falls_back_when_slug_empty(qr_units: dict[str, Unit]) -> None:
     """Units with names that slugify to empty should use the default filename."""
-    user = WMSUser.objects.create_user(email="owner2@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=user, name="!!!", description="desc")
+    storage_unit = qr_units["!!!"]
 
     assert storage_unit.get_qr_filename() == "unit_unit_qr.png"
 
 
 @pytest.mark.django_db
-def test_get_detail_path_matches_reverse() -> None:
+def test_get_detail_path_matches_reverse(user_pool: list[WMSUser], qr_units: dict[str, Unit]) -> None:
     """Detail path should match the named URL reversal."""
-    user = WMSUser.objects.create_user(email="owner3@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=user, name="Garage", description="desc")
+    user = user_pool[0]
+    storage_unit = qr_units["Garage"]
 
     expected_path = reverse(
         "unit_detail", kwargs={"user_id": user.id, "access_token": storage_unit.access_token}
@@ -71,67 +133,69 @@ def test_get_detail_path_matches_reverse() -> None:
 
 
 @pytest.mark.django_db
-def test_get_qr_code_joins_base_url_and_detail_path() -> None:
+def test_get_qr_code_joins_base_url_and_detail_path(monkeypatch: pytest.MonkeyPatch, qr_units: dict[str, Unit]) -> None:
     """Unit.get_qr_code should call helper with the fully-qualified detail URL."""
-    user = WMSUser.objects.create_user(email="owner4@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=user, name="Basement", description="desc")
+    storage_unit = qr_units["Basement"]
+
+    fake_file = FAKE_QR_FILES["basement_unit_qr.png"]
+    calls: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        core_models, "get_qr_code_file", lambda url, *, filename: calls.append((url, filename)) or fake_file
+    )
 
-    fake_file = ContentFile(b"qr-bytes", name="basement_qr.png")
-    with mock.patch("core.models.get_qr_code_file", return_value=fake_file) as mocked_helper:
-        result = storage_unit.get_qr_code(base_url="https://example.com/app")
+    result = storage_unit.get_qr_code(base_url="https://example.com/app")
 
-    mocked_helper.assert_called_once()
-    helper_args, helper_kwargs = mocked_helper.call_args
-    assert helper_args[0] == "https://example.com/app" + storage_unit.get_detail_path()
-    assert helper_kwargs["filename"] == storage_unit.get_qr_filename()
+    assert calls == [("https://example.com/app" + storage_unit.get_detail_path(), storage_unit.get_qr_filename())]
     assert result is fake_file
 
 
 @pytest.mark.django_db
-def test_unit_qr_view_allows_owner(client) -> None:
+def test_unit_qr_view_allows_owner(
+    client: Client, stub_get_qr_code: list[tuple[Unit, str]], user_pool: list[WMSUser], qr_units: dict[str, Unit]
+) -> None:
     """The unit owner should be able to download their QR code."""
-    user = WMSUser.objects.create_user(email="owner5@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=user, name="Pantry", description="desc")
+    user = user_pool[0]
+    storage_unit = qr_units["Pantry"]
+    url = reverse("unit_qr", args=(user.id, storage_unit.access_token))
     client.force_login(user)
 
-    fake_file = ContentFile(b"qr-content", name="pantry_qr.png")
-    with mock.patch.object(Unit, "get_qr_code", return_value=fake_file) as mocked_get_qr:
-        url = reverse("unit_qr", args=(user.id, storage_unit.access_token))
-        response = client.get(url)
+    response = client.get(url)
 
     assert response.status_code == 200
     assert response["Content-Type"] == "image/png"
-    assert response["Content-Disposition"] == 'attachment; filename="pantry_qr.png"'
-    mocked_get_qr.assert_called_once_with(base_url="http://testserver/")
+    assert response["Content-Disposition"] == 'attachment; filename="pantry_unit_qr.png"'
+    assert stub_get_qr_code == [(storage_unit, "http://testserver/")]
 
 
 @pytest.mark.django_db
-def test_unit_qr_view_allows_shared_user(client) -> None:
+def test_unit_qr_view_allows_shared_user(
+    rf: RequestFactory, stub_get_qr_code: list[tuple[Unit, str]], user_pool: list[WMSUser], qr_units: dict[str, Unit]
+) -> None:
     """Users with shared access should be able to download the QR code."""
-    owner = WMSUser.objects.create_user(email="owner6@example.com", password="pass123")
-    shared_user = WMSUser.objects.create_user(email="shared@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=owner, name="Office", description="desc")
+    owner, shared_user = user_pool[:2]
+    storage_unit = qr_units["Office"]
     UnitSharedAccess.objects.create(unit=storage_unit, user=shared_user, permission="read")
-    client.force_login(shared_user)
 
-    fake_file = ContentFile(b"qr-content", name="office_qr.png")
-    with mock.patch.object(Unit, "get_qr_code", return_value=fake_file):
-        url = reverse("unit_qr", args=(owner.id, storage_unit.access_token))
-        response = client.get(url)
+    # Call the view directly; routing and login are covered by the owner test
+    request = rf.get(reverse("unit_qr", args=(owner.id, storage_unit.access_token)))
+    request.user = shared_user
+    response = unit_qr_view(request, user_id=owner.id, access_token=storage_unit.access_token)
 
     assert response.status_code == 200
-    assert response["Content-Disposition"] == 'attachment; filename="office_qr.png"'
+    assert response["Content-Disposition"] == 'attachment; filename="office_unit_qr.png"'
+    assert len(stub_get_qr_code) == 1
 
 
 @pytest.mark.django_db
-def test_unit_qr_view_denies_unrelated_user(client) -> None:
+def test_unit_qr_view_denies_unrelated_user(
+    rf: RequestFactory, user_pool: list[WMSUser], qr_units: dict[str, Unit]
+) -> None:
     """Unrelated users should receive a 404 when requesting a QR code."""
-    owner = WMSUser.objects.create_user(email="owner7@example.com", password="pass123")
-    other_user = WMSUser.objects.create_user(email="other@example.com", password="pass123")
-    storage_unit = Unit.objects.create(user=owner, name="Attic", description="desc")
-    client.force_login(other_user)
+    owner, other_user = user_pool[:2]
+    storage_unit = qr_units["Attic"]
 
-    url = reverse("unit_qr", args=(owner.id, storage_unit.access_token))
-    response = client.get(url)
+    request = rf.get(reverse("unit_qr", args=(owner.id, storage_unit.access_token)))
+    request.user = other_user
 
-    assert response.status_code == 404
+    with pytest.raises(Http404):
+        unit_qr_view(request, user_id=owner.id, access_token=storage_unit.access_token)